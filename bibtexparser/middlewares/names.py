@@ -5,12 +5,67 @@ Much of the code is taken from Blair Bonnetts never merged v0 pull request
 """
 import abc
 import dataclasses
-from typing import List, Literal, Tuple
-
-from bibtexparser.model import Block, Entry, Field, MiddlewareErrorBlock
+import functools
+import re
+from copy import copy, deepcopy
+from string import ascii_lowercase, ascii_uppercase
+from sys import intern
+from typing import Collection, FrozenSet, List, Literal, Optional, Tuple, Union
+
+from bibtexparser.library import Library
+from bibtexparser.model import (
+    Block,
+    Entry,
+    Field,
+    MiddlewareErrorBlock,
+    _get_state,
+    _set_state,
+)
 
 from .middleware import BlockMiddleware
 
+# The word `and` separating two names, surrounded by whitespace.
+# Matches only start at the beginning of a whitespace run, such that long runs
+# not followed by `and` are scanned once rather than from each of their positions.
+_AND_SEPARATOR = re.compile(r"(?<![ \t\r\n])[ \t\r\n]+and[ \t\r\n]+", re.IGNORECASE)
+# Braces, and escaped characters (which must not be mistaken for braces).
+_BRACE_OR_ESCAPE = re.compile(r"\\.|[{}]", re.DOTALL)
+# An escaped character, or a braced group with up to three levels of nesting.
+_BRACED_GROUP_OR_ESCAPE = re.compile(
+    r"\\.|\{(?:[^\\{}]|\\.|\{(?:[^\\{}]|\\.|\{(?:[^\\{}]|\\.)*\})*\})*\}", re.DOTALL
+)
+
+# Classes of characters with a special meaning when parsing a single name.
+# All characters not in `_NAME_CHAR_CLASSES` are regular characters.
+(
+    _REGULAR_CHAR,
+    _ESCAPE_CHAR,
+    _OPEN_BRACE_CHAR,
+    _CLOSE_BRACE_CHAR,
+    _COMMA_CHAR,
+    _WHITESPACE_CHAR,
+) = range(6)
+_NAME_CHAR_CLASSES = {
+    "\\": _ESCAPE_CHAR,
+    "{": _OPEN_BRACE_CHAR,
+    "}": _CLOSE_BRACE_CHAR,
+    ",": _COMMA_CHAR,
+    " ": _WHITESPACE_CHAR,
+    "~": _WHITESPACE_CHAR,
+    "\r": _WHITESPACE_CHAR,
+    "\n": _WHITESPACE_CHAR,
+    "\t": _WHITESPACE_CHAR,
+}
+# Names without any of these characters are split into words without the state machine.
+_BRACE_OR_BACKSLASH = re.compile(r"[\\{}]")
+# A word in a name without braces and escapes.
+_PLAIN_NAME_WORD = re.compile(r"[^ ~\r\n\t]+")
+# The case of ASCII letters: 1 = uppercase, 0 = lowercase.
+_ASCII_LETTER_CASES = {
+    **{letter: 1 for letter in ascii_uppercase},
+    **{letter: 0 for letter in ascii_lowercase},
+}
+
 
 class InvalidNameError(ValueError):
     """Exception raised by :py:func:`parse_single_name_into_parts` when facing an invalid name."""
@@ -36,22 +91,64 @@ class _NameTransformerMiddleware(BlockMiddleware, abc.ABC):
             allow_parallel_execution=True,
         )
         self._name_fields = name_fields
+        # Used for the lookups when transforming entries, see `_name_fields_lookup`.
+        self._name_fields_set: Optional[FrozenSet[str]] = None
 
     @property
     def name_fields(self) -> Tuple[str]:
-        """The fields that contain names, considered by this middleware."""
+        """The fields that contain names, considered by this middleware.
+
+        Read once, when the middleware transforms its first entry."""
         return self._name_fields
 
+    def _name_fields_lookup(self) -> FrozenSet[str]:
+        """The `name_fields` as a set, built on first use (after subclass initialization)."""
+        if self._name_fields_set is None:
+            self._name_fields_set = frozenset(self.name_fields)
+        return self._name_fields_set
+
     @abc.abstractmethod
     def _transform_field_value(self, name):
         raise NotImplementedError("called abstract method")
 
+    # docstr-coverage: inherited
+    def transform_block(
+        self, block: Block, library: "Library"
+    ) -> Union[Block, Collection[Block], None]:
+        if not self.allow_inplace_modification and isinstance(block, Entry):
+            # Cheaper than the deepcopy done by the superclass.
+            return self.transform_entry(self._copy_entry(block), library)
+        return super().transform_block(block, library)
+
+    def _copy_entry(self, entry: Entry) -> Entry:
+        """Copy an entry, copying the values of the name fields only shallowly.
+
+        Name field values are only ever replaced, never modified, by
+        name-transforming middlewares. Hence their items can be shared with the copy.
+        The values themselves are still copied if they are lists, as a value may
+        remain in place when the transformation fails part-way."""
+        fields = [self._copy_field(field) for field in entry.fields]
+        # Deep-copy everything else of the entry (e.g. its parser metadata),
+        # using the copied fields for the `fields` list.
+        return deepcopy(entry, {id(entry.fields): fields})
+
+    def _copy_field(self, field: Field) -> Field:
+        """Copy a field, see :py:meth:`_copy_entry`."""
+        copied = copy(field)
+        value = field.value
+        if field.key in self._name_fields_lookup():
+            copied.value = list(value) if isinstance(value, list) else value
+        else:
+            copied.value = deepcopy(value)
+        return copied
+
     # docstr-coverage: inherited
     def transform_entry(self, entry: Entry, *args, **kwargs) -> Block:
         field: Field
+        name_fields = self._name_fields_lookup()
         try:
             for field in entry.fields:
-                if field.key in self.name_fields:
+                if field.key in name_fields:
                     field.value = self._transform_field_value(field.value)
             return entry
         except InvalidNameError as e:
@@ -86,17 +183,55 @@ class MergeCoAuthors(_NameTransformerMiddleware):
         return name
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(init=False)
 class NameParts:
     """A dataclass representing the parts of a person name.
 
     The different parts are defined according to BibTex's implementation
-    of name parts (first, von, last, jr)."""
+    of name parts (first, von, last, jr). Each part is a list of words,
+    which defaults to the empty list."""
 
-    first: List[str] = dataclasses.field(default_factory=list)
-    von: List[str] = dataclasses.field(default_factory=list)
-    last: List[str] = dataclasses.field(default_factory=list)
-    jr: List[str] = dataclasses.field(default_factory=list)
+    # Fields are declared by annotation only, as their slots
+    # would conflict with class-level defaults.
+    __slots__ = ("first", "von", "last", "jr")
+    first: List[str]
+    von: List[str]
+    last: List[str]
+    jr: List[str]
+
+    def __init__(
+        self,
+        first: Optional[List[str]] = None,
+        von: Optional[List[str]] = None,
+        last: Optional[List[str]] = None,
+        jr: Optional[List[str]] = None,
+    ):
+        self.first = [] if first is None else first
+        self.von = [] if von is None else von
+        self.last = [] if last is None else last
+        self.jr = [] if jr is None else jr
+
+    def __eq__(self, other):
+        # make sure they have the same type and same content
+        if other is self:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        # List comparison skips the character-wise comparison of identical
+        # (e.g. interned) words.
+        return (
+            self.first == other.first
+            and self.von == other.von
+            and self.last == other.last
+            and self.jr == other.jr
+        )
+
+    def __getstate__(self):
+        return _get_state(self)
+
+    def __setstate__(self, state):
+        # Also accepts the `__dict__` pickled by versions without `__slots__`.
+        _set_state(self, state)
 
     @property
     def merge_first_name_first(self) -> str:
@@ -121,18 +256,6 @@ class NameParts:
         The structure of the output is: `von Last, Jr, First`
         """
 
-        def escape_last_slash(string: str) -> str:
-            """Escape the last slash in a string if it is not escaped."""
-            # Find the number of trailing slashes
-            stripped = string.rstrip("\\")
-            num_slashes = len(string) - len(stripped)
-            if num_slashes % 2 == 0:
-                # Even number: everything is escaped
-                return string
-            else:
-                # Odd number: need to escape one.
-                return string + "\\"
-
         first = " ".join(self.first) if self.first else None
         von = " ".join(self.von) if self.von else None
         last = " ".join(self.last) if self.last else None
@@ -140,10 +263,23 @@ class NameParts:
 
         von_last = " ".join(name for name in [von, last] if name)
         return ", ".join(
-            escape_last_slash(name) for name in [von_last, jr, first] if name
+            _escape_last_slash(name) for name in [von_last, jr, first] if name
         )
 
 
+def _escape_last_slash(string: str) -> str:
+    """Escape the last slash in a string if it is not escaped."""
+    # Find the number of trailing slashes
+    stripped = string.rstrip("\\")
+    num_slashes = len(string) - len(stripped)
+    if num_slashes % 2 == 0:
+        # Even number: everything is escaped
+        return string
+    else:
+        # Odd number: need to escape one.
+        return string + "\\"
+
+
 class SplitNameParts(_NameTransformerMiddleware):
     """Middleware to split a persons name into its parts (first, von, last, jr).
 
@@ -254,16 +390,149 @@ def parse_single_name_into_parts(name, strict=True):
         {'last': ['Beethoven'], 'von': ['van'], 'first': ['Ludwig'], 'jr': []}
 
     """
+    # Names typically recur across the entries of a library, hence parsing
+    # results are cached. As NameParts are mutable, every call returns a copy.
+    parts = _parse_single_name_into_parts(name, strict)
+    return NameParts(
+        first=list(parts.first),
+        von=list(parts.von),
+        last=list(parts.last),
+        jr=list(parts.jr),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_single_name_into_parts(name: str, strict: bool) -> NameParts:
+    """Cached implementation of :py:func:`parse_single_name_into_parts`.
+
+    The returned instance is shared between calls and must not be modified."""
     # Useful references:
     # http://maverick.inria.fr/~Xavier.Decoret/resources/xdkbibtex/bibtex_summary.html#names
     # http://tug.ctan.org/info/bibtex/tamethebeast/ttb_en.pdf
 
-    # Whitespace characters that can separate words.
-    whitespace = set(" ~\r\n\t")
+    # Names without braces and escapes, by far the most common ones, are
+    # split at commas and whitespace using C-level string and regex methods.
+    # All other names are processed character-wise by a state machine.
+    # Words recur across names (e.g. `van`, `de`, `Jr.` or initials), so both
+    # helpers intern them to share one string object per distinct word.
+    if _BRACE_OR_BACKSLASH.search(name):
+        sections, cases = _split_name_into_sections(name, strict)
+    else:
+        sections, cases = _split_plain_name_into_sections(name, strict)
+
+    # Get rid of trailing sections.
+    if not sections[-1]:
+        # Trailing comma?
+        if (len(sections) > 1) and strict:
+            raise InvalidNameError(name=name, reason="Trailing comma at end of name")
+        sections.pop(-1)
+        cases.pop(-1)
+
+    # No non-whitespace input.
+    if not sections or not any(bool(section) for section in sections):
+        return NameParts()
+
+    # Initialise the output dictionary.
+    parts = NameParts()
+
+    # Form 1: "First von Last"
+    if len(sections) == 1:
+        p0 = sections[0]
+
+        # One word only: last cannot be empty.
+        if len(p0) == 1:
+            parts.last = p0
+
+        # Two words: must be first and last.
+        elif len(p0) == 2:
+            parts.first = p0[:1]
+            parts.last = p0[1:]
+
+        # Need to use the cases to figure it out.
+        else:
+            cases = cases[0]
+
+            # First is the longest sequence of words starting with uppercase
+            # that is not the whole string. von is then the longest sequence
+            # whose last word starts with lowercase that is not the whole
+            # string. Last is the rest. NB., this means last cannot be empty.
+
+            # At least one lowercase letter.
+            if 0 in cases:
+                # Index from end of list of first and last lowercase word.
+                firstl = cases.index(0) - len(cases)
+                lastl = -cases[::-1].index(0) - 1
+                if lastl == -1:
+                    lastl -= 1  # Cannot consume the rest of the string.
+
+                # Pull the parts out.
+                parts.first = p0[:firstl]
+                parts.von = p0[firstl : lastl + 1]
+                parts.last = p0[lastl + 1 :]
+
+            # No lowercase: last is the last word, first is everything else.
+            else:
+                parts.first = p0[:-1]
+                parts.last = p0[-1:]
+
+    # Form 2 ("von Last, First") or 3 ("von Last, jr, First")
+    else:
+        # As long as there is content in the first name partition, use it as-is.
+        first = sections[-1]
+        if first and first[0]:
+            parts.first = first
+
+        # And again with the jr part.
+        if len(sections) == 3:
+            jr = sections[-2]
+            if jr and jr[0]:
+                parts.jr = jr
+
+        # Last name cannot be empty; if there is only one word in the first
+        # partition, we have to use it for the last name.
+        last = sections[0]
+        if len(last) == 1:
+            parts.last = last
+
+        # Have to look at the cases to figure it out.
+        else:
+            lcases = cases[0]
+
+            # Check if at least one of the words is lowercase
+            if 0 in lcases:
+                # Excluding the last word, find the index of the last lower word
+                split = _rindex(lcases[:-1], 0, -1) + 1
+                parts.von = sections[0][:split]
+                parts.last = sections[0][split:]
+
+            # All uppercase => all last.
+            else:
+                parts.last = sections[0]
+
+    # Done.
+    return parts
+
+
+def _rindex(l, x, default):
+    """Returns the index of the rightmost occurence of x in l."""
+    for i in range(len(l) - 1, -1, -1):
+        if l[i] == x:
+            return i
+    return default
+
 
+def _split_name_into_sections(
+    name: str, strict: bool
+) -> Tuple[List[List[str]], List[List[int]]]:
+    """Split a name into the words of its comma-separated sections.
+
+    Returns the sections and, for every word, its case
+    (1 = uppercase, 0 = lowercase, -1 = caseless).
+    See :py:func:`parse_single_name_into_parts` for the parameters
+    and the errors raised in strict mode."""
     # We'll iterate over the input once, dividing it into a list of words for
     # each comma-separated section. We'll also calculate the case of each word
-    # as we work.
+    # as we work. Every character is classified once, using a lookup table.
     sections = [[]]  # Sections of the name.
     cases = [[]]  # 1 = uppercase, 0 = lowercase, -1 = caseless.
     word = []  # Current word.
@@ -276,16 +545,30 @@ def parse_single_name_into_parts(name, strict=True):
     # Using an iterator allows us to deal with escapes in a simple manner.
     nameiter = iter(name)
     for char in nameiter:
+        char_class = _NAME_CHAR_CLASSES.get(char, _REGULAR_CHAR)
+
+        # Regular character outside of braces: by far the most common case.
+        # NB. bracestart is always false outside of braces.
+        if char_class == _REGULAR_CHAR and not level:
+            word.append(char)
+            if (case == -1) and char.isalpha():
+                if char.isupper():
+                    case = 1
+                else:
+                    case = 0
+            continue
+
         # An escape.
-        if char == "\\":
+        if char_class == _ESCAPE_CHAR:
             try:
                 escaped = next(nameiter)
 
                 # BibTeX doesn't allow whitespace escaping. Copy the slash and fall
                 # through to the normal case to handle the whitespace.
-                if escaped in whitespace:
+                if _NAME_CHAR_CLASSES.get(escaped) == _WHITESPACE_CHAR:
                     word.append(char)
                     char = escaped
+                    char_class = _WHITESPACE_CHAR
 
                 else:
                     # Is this the first character in a brace?
@@ -310,9 +593,10 @@ def parse_single_name_into_parts(name, strict=True):
             # If we're at the end of the string, then the \ is just a \.
             except StopIteration:
                 word.append(char)
+                char_class = _REGULAR_CHAR
 
         # Start of a braced expression.
-        if char == "{":
+        if char_class == _OPEN_BRACE_CHAR:
             level += 1
             word.append(char)
             bracestart = True
@@ -324,7 +608,7 @@ def parse_single_name_into_parts(name, strict=True):
         bracestart = False
 
         # End of a braced expression.
-        if char == "}":
+        if char_class == _CLOSE_BRACE_CHAR:
             # Check and reduce the level.
             if level:
                 level -= 1
@@ -360,10 +644,10 @@ def parse_single_name_into_parts(name, strict=True):
 
         # End of a word.
         # NB. we know we're not in a brace here due to the previous case.
-        if char == "," or char in whitespace:
+        if char_class == _COMMA_CHAR or char_class == _WHITESPACE_CHAR:
             # Don't add empty words due to repeated whitespace.
             if word:
-                sections[-1].append("".join(word))
+                sections[-1].append(intern("".join(word)))
                 word = []
                 cases[-1].append(case)
                 case = -1
@@ -371,7 +655,7 @@ def parse_single_name_into_parts(name, strict=True):
                 specialchar = False
 
             # End of a section.
-            if char == ",":
+            if char_class == _COMMA_CHAR:
                 if len(sections) < 3:
                     sections.append([])
                     cases.append([])
@@ -379,13 +663,8 @@ def parse_single_name_into_parts(name, strict=True):
                     raise InvalidNameError(name=name, reason="Too many commas")
             continue
 
-        # Regular character.
+        # Regular character (a trailing backslash).
         word.append(char)
-        if (case == -1) and char.isalpha():
-            if char.isupper():
-                case = 1
-            else:
-                case = 0
 
     # Unterminated brace?
     if level:
@@ -397,107 +676,43 @@ def parse_single_name_into_parts(name, strict=True):
 
     # Handle the final word.
     if word:
-        sections[-1].append("".join(word))
+        sections[-1].append(intern("".join(word)))
         cases[-1].append(case)
 
-    # Get rid of trailing sections.
-    if not sections[-1]:
-        # Trailing comma?
-        if (len(sections) > 1) and strict:
-            raise InvalidNameError(name=name, reason="Trailing comma at end of name")
-        sections.pop(-1)
-        cases.pop(-1)
-
-    # No non-whitespace input.
-    if not sections or not any(bool(section) for section in sections):
-        return NameParts()
+    return sections, cases
 
-    # Initialise the output dictionary.
-    parts = NameParts()
 
-    # Form 1: "First von Last"
-    if len(sections) == 1:
-        p0 = sections[0]
-
-        # One word only: last cannot be empty.
-        if len(p0) == 1:
-            parts.last = p0
-
-        # Two words: must be first and last.
-        elif len(p0) == 2:
-            parts.first = p0[:1]
-            parts.last = p0[1:]
-
-        # Need to use the cases to figure it out.
-        else:
-            cases = cases[0]
-
-            # First is the longest sequence of words starting with uppercase
-            # that is not the whole string. von is then the longest sequence
-            # whose last word starts with lowercase that is not the whole
-            # string. Last is the rest. NB., this means last cannot be empty.
-
-            # At least one lowercase letter.
-            if 0 in cases:
-                # Index from end of list of first and last lowercase word.
-                firstl = cases.index(0) - len(cases)
-                lastl = -cases[::-1].index(0) - 1
-                if lastl == -1:
-                    lastl -= 1  # Cannot consume the rest of the string.
-
-                # Pull the parts out.
-                parts.first = p0[:firstl]
-                parts.von = p0[firstl : lastl + 1]
-                parts.last = p0[lastl + 1 :]
-
-            # No lowercase: last is the last word, first is everything else.
-            else:
-                parts.first = p0[:-1]
-                parts.last = p0[-1:]
-
-    # Form 2 ("von Last, First") or 3 ("von Last, jr, First")
-    else:
-        # As long as there is content in the first name partition, use it as-is.
-        first = sections[-1]
-        if first and first[0]:
-            parts.first = first
-
-        # And again with the jr part.
-        if len(sections) == 3:
-            jr = sections[-2]
-            if jr and jr[0]:
-                parts.jr = jr
-
-        # Last name cannot be empty; if there is only one word in the first
-        # partition, we have to use it for the last name.
-        last = sections[0]
-        if len(last) == 1:
-            parts.last = last
-
-        # Have to look at the cases to figure it out.
-        else:
-            lcases = cases[0]
-
-            def rindex(l, x, default):
-                """Returns the index of the rightmost occurence of x in l."""
-                for i in range(len(l) - 1, -1, -1):
-                    if l[i] == x:
-                        return i
-                return default
-
-            # Check if at least one of the words is lowercase
-            if 0 in lcases:
-                # Excluding the last word, find the index of the last lower word
-                split = rindex(lcases[:-1], 0, -1) + 1
-                parts.von = sections[0][:split]
-                parts.last = sections[0][split:]
-
-            # All uppercase => all last.
-            else:
-                parts.last = sections[0]
-
-    # Done.
-    return parts
+def _split_plain_name_into_sections(
+    name: str, strict: bool
+) -> Tuple[List[List[str]], List[List[int]]]:
+    """Equivalent of :py:func:`_split_name_into_sections` for names without braces and escapes."""
+    parts = name.split(",")
+    if len(parts) > 3:
+        if strict:
+            raise InvalidNameError(name=name, reason="Too many commas")
+        # Words after any surplus comma are part of the last section.
+        parts[2:] = [" ".join(parts[2:])]
+
+    sections = [list(map(intern, _PLAIN_NAME_WORD.findall(part))) for part in parts]
+    # Most words start with an ASCII letter, whose case is looked up directly.
+    cases = [
+        [
+            _ASCII_LETTER_CASES[word[0]]
+            if word[0] in _ASCII_LETTER_CASES
+            else _case_of_first_letter(word)
+            for word in section
+        ]
+        for section in sections
+    ]
+    return sections, cases
+
+
+def _case_of_first_letter(string: str) -> int:
+    """The case of the first letter in `string`: 1 = uppercase, 0 = lowercase, -1 = caseless."""
+    for char in string:
+        if char.isalpha():
+            return 1 if char.isupper() else 0
+    return -1
 
 
 def split_multiple_persons_names(names):
@@ -539,103 +754,67 @@ def split_multiple_persons_names(names):
     if not names:
         return []
 
-    # Steps to find the ' and ' token.
-    START_WHITESPACE, FIND_A, FIND_N, FIND_D, END_WHITESPACE, NEXT_WORD = (
-        0,
-        1,
-        2,
-        3,
-        4,
-        5,
-    )
+    # Braced groups are masked, such that the `and` separators can be
+    # found with a single regex search over the masked string. As masking
+    # preserves the length, the resulting offsets are valid for `names`.
+    persons = []
+    start = 0
+    for separator in _AND_SEPARATOR.finditer(_mask_braced_groups(names)):
+        persons.append(names[start : separator.start()])
+        start = separator.end()
+    persons.append(names[start:])
+    return persons
 
-    # Processing variables.
-    step = START_WHITESPACE  # Current step.
-    pos = 0  # Current position in string.
-    bracelevel = 0  # Current bracelevel.
-    spans = [[0]]  # Spans of names within the string.
-    possible_end = 0  # Possible end position of a name.
-    whitespace = set(" \r\n\t")  # Allowed whitespace characters.
-
-    # Loop over the string.
-    namesiter = iter(names)
-    for char in namesiter:
-        pos += 1
-
-        # Escaped character.
-        if char == "\\":
-            try:
-                next(namesiter)
-            # If we're at the end of the string, then the \ is just a \.
-            except StopIteration:
-                pass
-            pos += 1
-            continue
 
-        # Change in brace level.
-        if char == "{":
-            bracelevel += 1
-            step = START_WHITESPACE
-            continue
-        if char == "}":
-            if bracelevel:
-                bracelevel -= 1
-            step = START_WHITESPACE
-            continue
+def _mask_braced_groups(string: str) -> str:
+    """Replace every top-level braced group (including its braces) by NUL characters.
 
-        # Ignore everything inside a brace.
-        if bracelevel:
-            step = START_WHITESPACE
-            continue
+    The returned string has the same length as the input.
+    An unterminated group is masked until the end of the string,
+    unmatched closing braces are left untouched."""
+    if "{" not in string:
+        return string
 
-        # Looking for a whitespace character to start the ' and '. When we find
-        # one, mark it as the possible end of the previous word.
-        if step == START_WHITESPACE:
-            if char in whitespace:
-                step = FIND_A
-                possible_end = pos - 1
-
-        # Looking for the letter a. NB., we can have multiple whitespace
-        # characters so we need to handle that here.
-        elif step == FIND_A:
-            if char in ("a", "A"):
-                step = FIND_N
-            elif char not in whitespace:
-                step = START_WHITESPACE
-
-        # Looking for the letter n.
-        elif step == FIND_N:
-            if char in ("n", "N"):
-                step = FIND_D
-            else:
-                step = START_WHITESPACE
+    # Common case: all groups are matched by a single regex substitution.
+    masked = _BRACED_GROUP_OR_ESCAPE.sub(_mask_braced_group, string)
+    if "{" not in masked:
+        return masked
 
-        # Looking for the letter d.
-        elif step == FIND_D:
-            if char in ("d", "D"):
-                step = END_WHITESPACE
-            else:
-                step = START_WHITESPACE
+    # Deeply nested, unterminated or escaped braces: track the brace level.
+    return _mask_braced_groups_by_level(string)
 
-        # And now the whitespace to end the ' and '.
-        elif step == END_WHITESPACE:
-            if char in whitespace:
-                step = NEXT_WORD
-            else:
-                step = START_WHITESPACE
-
-        # Again, we need to handle multiple whitespace characters. Keep going
-        # until we find the start of the next word.
-        elif step == NEXT_WORD:
-            if char not in whitespace:
-                # Finish the previous word span, start the next,
-                # and do it all again.
-                spans[-1].append(possible_end)
-                spans.append([pos - 1])
-                step = START_WHITESPACE
-
-    # Finish the last word.
-    spans[-1].append(None)
-
-    # Extract and return the names.
-    return [names[start:end] for start, end in spans]
+
+def _mask_braced_group(match: re.Match) -> str:
+    """Replacement function masking braced groups, but not escapes."""
+    text = match.group()
+    if text[0] == "\\":
+        return text
+    return "\0" * len(text)
+
+
+def _mask_braced_groups_by_level(string: str) -> str:
+    """Equivalent of :py:func:`_mask_braced_groups`, supporting any input."""
+    pieces = []
+    level = 0  # Current brace level.
+    group_start = 0  # Position of the opening brace of the current group.
+    unmasked_start = 0  # Start of the not-yet-copied part of the string.
+    for match in _BRACE_OR_ESCAPE.finditer(string):
+        token = match.group()
+        if token == "{":
+            if not level:
+                group_start = match.start()
+            level += 1
+        elif token == "}" and level:
+            level -= 1
+            if not level:
+                pieces.append(string[unmasked_start:group_start])
+                pieces.append("\0" * (match.end() - group_start))
+                unmasked_start = match.end()
+
+    if level:
+        pieces.append(string[unmasked_start:group_start])
+        pieces.append("\0" * (len(string) - group_start))
+        unmasked_start = len(string)
+
+    pieces.append(string[unmasked_start:])
+    return "".join(pieces)
@@ -1,5 +1,101 @@
 import abc
-from typing import Any, Dict, List, Optional, Set
+import functools
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+@functools.lru_cache(maxsize=None)
+def _attribute_names(cls: type) -> Tuple[str, ...]:
+    """The names of the slots of `cls` and its superclasses, holding its attributes.
+
+    Private names (e.g. `__x`) are mangled, as they are stored on the instance."""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return tuple(names)
+
+
+# Default for reading slots, to tell apart slots which are not set.
+_UNSET = object()
+
+
+def _set_attributes(obj: Any) -> Dict[str, Any]:
+    """The values of the slots of `obj` which are set, by slot name."""
+    attributes = {}
+    for name in _attribute_names(obj.__class__):
+        value = getattr(obj, name, _UNSET)
+        if value is not _UNSET:
+            attributes[name] = value
+    return attributes
+
+
+def _state(obj: Any) -> Tuple[Any, ...]:
+    """The values of all attributes of `obj`, to compare instances by content."""
+    values = tuple(
+        getattr(obj, name, _UNSET) for name in _attribute_names(obj.__class__)
+    )
+    # Subclasses outside this module may not declare `__slots__`.
+    return values + (getattr(obj, "__dict__", None),)
+
+
+# Types of attribute values which are immutable, hence need no deep copy.
+_ATOMIC_TYPES = frozenset({type(None), bool, int, float, str})
+
+
+def _get_state(obj: Any) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """The state of `obj` to pickle, in the format used by default for slotted classes."""
+    return getattr(obj, "__dict__", None), _set_attributes(obj)
+
+
+def _set_state(obj: Any, state: Any):
+    """Restore the pickled state of `obj`.
+
+    Besides the state of slotted instances, this accepts the `__dict__` pickled
+    by versions in which the classes did not declare `__slots__`."""
+    if isinstance(state, tuple):
+        dict_state, slots_state = state
+    else:
+        dict_state, slots_state = state, None
+    for attributes in (dict_state, slots_state):
+        if attributes:
+            for name, value in attributes.items():
+                setattr(obj, name, value)
+
+
+def _copy(obj: Any) -> Any:
+    """Shallow copy of `obj`, setting the attributes of the copy directly."""
+    new = obj.__class__.__new__(obj.__class__)
+    for name in _attribute_names(obj.__class__):
+        value = getattr(obj, name, _UNSET)
+        if value is not _UNSET:
+            setattr(new, name, value)
+    if hasattr(obj, "__dict__"):
+        new.__dict__.update(obj.__dict__)
+    return new
+
+
+def _deepcopy(obj: Any, memo: Dict[int, Any]) -> Any:
+    """Deep copy of `obj`, only delegating non-atomic attribute values to `deepcopy`."""
+    new = obj.__class__.__new__(obj.__class__)
+    memo[id(obj)] = new
+    for name in _attribute_names(obj.__class__):
+        value = getattr(obj, name, _UNSET)
+        if value is _UNSET:
+            continue
+        if value.__class__ not in _ATOMIC_TYPES:
+            value = deepcopy(value, memo)
+        setattr(new, name, value)
+    if hasattr(obj, "__dict__"):
+        new.__dict__.update(deepcopy(obj.__dict__, memo))
+    return new
 
 
 class Block(abc.ABC):
@@ -7,6 +103,8 @@ class Block(abc.ABC):
 
     E.g. a `@string` block, a `@preamble` block, an `@entry` block, a comment, etc."""
 
+    __slots__ = ("_start_line_in_file", "_raw", "_parser_metadata", "__weakref__")
+
     def __init__(
         self,
         start_line: Optional[int] = None,
@@ -67,13 +165,27 @@ class Block(abc.ABC):
         return (
             isinstance(other, self.__class__)
             and isinstance(self, other.__class__)
-            and self.__dict__ == other.__dict__
+            and _state(self) == _state(other)
         )
 
+    def __copy__(self):
+        return _copy(self)
+
+    def __deepcopy__(self, memo):
+        return _deepcopy(self, memo)
+
+    def __getstate__(self):
+        return _get_state(self)
+
+    def __setstate__(self, state):
+        _set_state(self, state)
+
 
 class String(Block):
     """Bibtex Blocks of the `@string` type, e.g. @string{me = "My Name"}."""
 
+    __slots__ = ("_key", "_value")
+
     def __init__(
         self,
         key: str,
@@ -116,6 +228,8 @@ class String(Block):
 class Preamble(Block):
     """Bibtex Blocks of the `@preamble` type, e.g. @preamble{This is a preamble}."""
 
+    __slots__ = ("_value",)
+
     def __init__(
         self, value: str, start_line: Optional[int] = None, raw: Optional[str] = None
     ):
@@ -144,6 +258,8 @@ class Preamble(Block):
 class ExplicitComment(Block):
     """Bibtex Blocks of the `@comment` type, e.g. @comment{This is a comment}."""
 
+    __slots__ = ("_comment",)
+
     def __init__(
         self, comment: str, start_line: Optional[int] = None, raw: Optional[str] = None
     ):
@@ -172,6 +288,8 @@ class ExplicitComment(Block):
 class ImplicitComment(Block):
     """Bibtex outside of an @{...} block, which is treated as a comment."""
 
+    __slots__ = ("_comment",)
+
     def __init__(
         self, comment: str, start_line: Optional[int] = None, raw: Optional[str] = None
     ):
@@ -200,6 +318,8 @@ class ImplicitComment(Block):
 class Field:
     """A field of a Bibtex entry, e.g. `author = {John Doe}`."""
 
+    __slots__ = ("_start_line", "_key", "_value", "__weakref__")
+
     def __init__(self, key: str, value: Any, start_line: Optional[int] = None):
         self._start_line = start_line
         self._key = key
@@ -233,9 +353,21 @@ class Field:
         return (
             isinstance(other, self.__class__)
             and isinstance(self, other.__class__)
-            and self.__dict__ == other.__dict__
+            and _state(self) == _state(other)
         )
 
+    def __copy__(self):
+        return _copy(self)
+
+    def __deepcopy__(self, memo):
+        return _deepcopy(self, memo)
+
+    def __getstate__(self):
+        return _get_state(self)
+
+    def __setstate__(self, state):
+        _set_state(self, state)
+
     def __str__(self):
         return f"Field (line: {self.start_line}, key: `{self.key}`): `{self.value}`"
 
@@ -249,6 +381,8 @@ class Field:
 class Entry(Block):
     """Bibtex Blocks of the `@entry` type, e.g. @article{Cesar2013, ...}."""
 
+    __slots__ = ("_entry_type", "_key", "_fields")
+
     def __init__(
         self,
         entry_type: str,
@@ -345,6 +479,8 @@ class Entry(Block):
 class ParsingFailedBlock(Block):
     """A block that could not be parsed due to some raised exception."""
 
+    __slots__ = ("_error", "_ignore_error_block")
+
     def __init__(
         self,
         error: Exception,
@@ -377,6 +513,8 @@ class MiddlewareErrorBlock(ParsingFailedBlock):
     To get the block that caused this error, call `block.ignore_error_block`
     (which is the block with the middleware not or only partially applied)."""
 
+    __slots__ = ()
+
     def __init__(self, block: Block, error: Exception):
         super().__init__(
             start_line=block.start_line,
@@ -391,6 +529,8 @@ class DuplicateBlockKeyBlock(ParsingFailedBlock):
 
     To get the block that caused this error, call `block.ignore_error_block`."""
 
+    __slots__ = ("_key", "_previous_block")
+
     def __init__(
         self,
         key: str,
@@ -426,6 +566,8 @@ class DuplicateBlockKeyBlock(ParsingFailedBlock):
 class DuplicateFieldKeyBlock(ParsingFailedBlock):
     """An error-indicating block indicating a duplicate field key in an entry."""
 
+    __slots__ = ("_duplicate_keys",)
+
     def __init__(self, duplicate_keys: Set[str], entry: Entry):
         sorted_duplicate_keys = sorted(list(duplicate_keys))
         super().__init__(
@@ -1,9 +1,10 @@
 from copy import deepcopy
-from typing import Optional
+from operator import attrgetter
+from typing import Optional, Tuple
 
 from bibtexparser.library import Library
 from bibtexparser.middlewares.middleware import Middleware
-from bibtexparser.model import Block, ExplicitComment, ImplicitComment, Preamble
+from bibtexparser.model import Block, Entry, ExplicitComment, ImplicitComment, Preamble
 
 
 def assert_block_does_not_change(
@@ -51,9 +52,22 @@ def assert_inplace_is_respected(
         assert transformed_block is not input_block
 
 
+# All attributes of an entry except `fields`, as a tuple.
+_nonfield_entry_attributes = attrgetter("start_line", "raw", "entry_type", "key")
+
+
+def snapshot_nonfield_entry_attributes(entry: Entry) -> Tuple:
+    """Record all attributes of entry (except `fields`), e.g. before transforming it."""
+    return _nonfield_entry_attributes(entry)
+
+
 def assert_nonfield_entry_attributes_unchanged(original_copy, transformed_entry):
     """Verify all attributes of entry (except `fields`) are identical."""
-    assert transformed_entry.start_line == original_copy.start_line
-    assert transformed_entry.raw == original_copy.raw
-    assert transformed_entry.entry_type == original_copy.entry_type
-    assert transformed_entry.key == original_copy.key
+    assert _nonfield_entry_attributes(transformed_entry) == _nonfield_entry_attributes(
+        original_copy
+    )
+
+
+def assert_nonfield_snapshot_unchanged(snapshot: Tuple, transformed_entry: Entry):
+    """Verify all attributes of entry (except `fields`) match the recorded snapshot."""
+    assert _nonfield_entry_attributes(transformed_entry) == snapshot
@@ -1,9 +1,14 @@
-from copy import deepcopy
-from typing import Dict, List
+import dataclasses
+import pickle
+import re
+import time
+from itertools import product
+from typing import Dict, List, Pattern, Tuple
 
 import pytest as pytest
 
 from bibtexparser.library import Library
+from bibtexparser.middlewares.middleware import BlockMiddleware
 from bibtexparser.middlewares.names import (
     InvalidNameError,
     MergeCoAuthors,
@@ -14,12 +19,17 @@ from bibtexparser.middlewares.names import (
     parse_single_name_into_parts,
     split_multiple_persons_names,
 )
-from bibtexparser.model import Entry, Field
+from bibtexparser.model import Entry, Field, MiddlewareErrorBlock
 from tests.middleware_tests.middleware_test_util import (
     assert_inplace_is_respected,
-    assert_nonfield_entry_attributes_unchanged,
+    assert_nonfield_snapshot_unchanged,
+    snapshot_nonfield_entry_attributes,
 )
 
+# Values of the entries in the middleware tests which are not subject to the test.
+TITLE_VALUE = "A Test and Some More"
+RAW_SENTINEL = "irrelevant-for-this-test"
+
 
 @pytest.mark.parametrize(
     "field_value, expected",
@@ -79,6 +89,50 @@ def test_split_coauthors_consistent_with_bibtex(field_value: str, expected: List
     assert split_multiple_persons_names(field_value) == expected
 
 
+@pytest.mark.parametrize(
+    "field_value, expected",
+    [
+        ("John \\{Smith and Phil Holden", ["John \\{Smith", "Phil Holden"]),
+        ("John {Smith and Phil Holden", ["John {Smith and Phil Holden"]),
+        # Cases split differently before the splitting was based on a regex.
+        ("John Smith and {Phil Holden}", ["John Smith", "{Phil Holden}"]),
+        ("{John Smith} and {Phil Holden}", ["{John Smith}", "{Phil Holden}"]),
+        ("John Smith and \\'{E}ric Holden", ["John Smith", "\\'{E}ric Holden"]),
+        ("Smith, A and Jones", ["Smith, A", "Jones"]),
+        ("John Smith\\ and Phil Holden", ["John Smith\\", "Phil Holden"]),
+        ("John Smith\\  and Phil Holden", ["John Smith\\", "Phil Holden"]),
+        ("John Smith and\t\\'Eric Holden", ["John Smith", "\\'Eric Holden"]),
+        ("John Smith \\xand Phil Holden", ["John Smith \\xand Phil Holden"]),
+        ("John Smith} and {Phil Holden", ["John Smith}", "{Phil Holden"]),
+    ],
+)
+def test_split_coauthors_braces_and_escapes(field_value: str, expected: List[str]):
+    """Tests splitting of coauthors next to braced groups and escaped characters."""
+    assert split_multiple_persons_names(field_value) == expected
+
+
+@pytest.mark.parametrize(
+    "separator", ["".join(letters) for letters in product("aA", "nN", "dD")]
+)
+def test_split_coauthors_separator_casing(separator: str):
+    """Tests that the `and` separator is recognized in any casing."""
+    field_value = f"John Smith {separator} Phil Holden {separator}\tJane Doe"
+    expected = ["John Smith", "Phil Holden", "Jane Doe"]
+    assert split_multiple_persons_names(field_value) == expected
+
+
+@pytest.mark.parametrize("whitespace", [" ", "\t", " \n"])
+def test_split_coauthors_long_whitespace_run(whitespace: str):
+    """Tests that long whitespace runs, not followed by `and`, are split in linear time."""
+    field_value = "John Smith" + whitespace * 30_000 + "Phil Holden and Jane Doe"
+    start = time.perf_counter()
+    persons = split_multiple_persons_names(field_value)
+    duration = time.perf_counter() - start
+    assert persons == ["John Smith" + whitespace * 30_000 + "Phil Holden", "Jane Doe"]
+    # Quadratic scanning takes several seconds for inputs of this length.
+    assert duration < 1
+
+
 @pytest.mark.parametrize(
     "name",
     [
@@ -96,29 +150,36 @@ def test_name_splitting_whitespace_inputs(name: str):
     assert parse_single_name_into_parts(name) == NameParts()
 
 
+def _error_message_pattern(name: str, reason: str) -> Pattern:
+    """Pattern of an `InvalidNameError` message, which must contain the name and the reason."""
+    return re.compile(f".*{re.escape(name)}.*{re.escape(reason)}.*", re.DOTALL)
+
+
 @pytest.mark.parametrize(
-    "name, reason",
+    "name, message_pattern",
     [
-        ("BB,", "Trailing comma at end of name"),
-        ("BB, ", "Trailing comma at end of name"),
-        ("BB, ~\t", "Trailing comma at end of name"),
-        (", ~\t", "Trailing comma at end of name"),
-        ("AA, BB, CC, DD", "Too many commas"),
-        ("AA {BB CC", "Unterminated opening brace"),
-        ("AA {{{BB CC", "Unterminated opening brace"),
-        ("AA {{{BB} CC}", "Unterminated opening brace"),
-        ("AA BB CC}", "Unmatched closing brace"),
-        ("AA BB CC}}}", "Unmatched closing brace"),
-        ("{AA {BB CC}}}", "Unmatched closing brace"),
+        (name, _error_message_pattern(name, reason))
+        for name, reason in [
+            ("BB,", "Trailing comma at end of name"),
+            ("BB, ", "Trailing comma at end of name"),
+            ("BB, ~\t", "Trailing comma at end of name"),
+            (", ~\t", "Trailing comma at end of name"),
+            ("AA, BB, CC, DD", "Too many commas"),
+            ("AA {BB CC", "Unterminated opening brace"),
+            ("AA {{{BB CC", "Unterminated opening brace"),
+            ("AA {{{BB} CC}", "Unterminated opening brace"),
+            ("AA BB CC}", "Unmatched closing brace"),
+            ("AA BB CC}}}", "Unmatched closing brace"),
+            ("{AA {BB CC}}}", "Unmatched closing brace"),
+        ]
     ],
 )
-def test_name_splitting_strict_mode(name: str, reason: str):
+def test_name_splitting_strict_mode(name: str, message_pattern: Pattern):
     """Test that name splitting raises correct exceptions in strict mode.
 
     Based on https://github.com/bcbnz/python-bibtexparser/blob/utils/bibtexparser/tests/test_parsename.py#L25
     """
-    # message must contain the name and the reason
-    with pytest.raises(InvalidNameError, match=f".*{name}.*{reason}.*"):
+    with pytest.raises(InvalidNameError, match=message_pattern):
         parse_single_name_into_parts(name, strict=True)
 
 
@@ -207,6 +268,51 @@ def test_name_splitting_commas_at_higher_brace_level(strict: bool):
     assert result == expected
 
 
+def test_name_splitting_returns_independent_results():
+    """Test that modifying a parsed name does not affect later parsing results."""
+    first_result = parse_single_name_into_parts("Donald E. Knuth")
+    first_result.first.append("Ervin")
+    first_result.last = ["Lamport"]
+
+    second_result = parse_single_name_into_parts("Donald E. Knuth")
+    assert second_result == NameParts(first=["Donald", "E."], last=["Knuth"])
+    assert second_result is not first_result
+
+
+def test_name_parts_is_dataclass():
+    """Test that `NameParts` supports the functions of the `dataclasses` module."""
+    name_parts = NameParts(first=["Ludwig"], von=["van"], last=["Beethoven"])
+    assert dataclasses.is_dataclass(name_parts)
+    assert dataclasses.asdict(name_parts) == {
+        "first": ["Ludwig"],
+        "von": ["van"],
+        "last": ["Beethoven"],
+        "jr": [],
+    }
+    assert dataclasses.replace(name_parts, jr=["Jr."]) == NameParts(
+        first=["Ludwig"], von=["van"], last=["Beethoven"], jr=["Jr."]
+    )
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_name_parts_pickle(protocol: int):
+    name_parts = NameParts(first=["Ludwig"], von=["van"], last=["Beethoven"])
+    assert pickle.loads(pickle.dumps(name_parts, protocol=protocol)) == name_parts
+
+
+def test_name_parts_unpickle_without_slots():
+    # Pickled by a version in which NameParts had no `__slots__`, i.e., `pickle.dumps(
+    #     NameParts(first=["Ludwig"], von=["van"], last=["Beethoven"]), protocol=2)`.
+    pickled = (
+        b"\x80\x02cbibtexparser.middlewares.names\nNameParts\nq\x00)\x81q\x01}q\x02("
+        b"X\x05\x00\x00\x00firstq\x03]q\x04X\x06\x00\x00\x00Ludwigq\x05aX\x03\x00"
+        b"\x00\x00vonq\x06]q\x07X\x03\x00\x00\x00vanq\x08aX\x04\x00\x00\x00lastq\t]q"
+        b"\nX\t\x00\x00\x00Beethovenq\x0baX\x02\x00\x00\x00jrq\x0c]q\rub."
+    )
+    expected = NameParts(first=["Ludwig"], von=["van"], last=["Beethoven"])
+    assert pickle.loads(pickled) == expected
+
+
 REGULAR_NAME_PARTS_PARSING_TEST_CASES = (
     (
         r"Per Brinch Hansen",
@@ -848,23 +954,28 @@ REGULAR_NAME_PARTS_PARSING_TEST_CASES = (
     ),
 )
 
+# Same as above, with the expected values converted to NameParts once for all tests.
+REGULAR_NAME_PARTS_PARSING_TEST_CASES_PRECOMPUTED = tuple(
+    (name, _dict_to_nameparts(expected_as_dict))
+    for name, expected_as_dict in REGULAR_NAME_PARTS_PARSING_TEST_CASES
+)
+
 
 @pytest.mark.parametrize(
-    "name, expected_as_dict", REGULAR_NAME_PARTS_PARSING_TEST_CASES
+    "name, expected", REGULAR_NAME_PARTS_PARSING_TEST_CASES_PRECOMPUTED
 )
 @pytest.mark.parametrize("strict", [True, False], ids=["strict", "non-strict"])
-def test_split_name_into_parts(name, expected_as_dict, strict):
+def test_split_name_into_parts(name, expected, strict):
     # As all inputs are valid, strict/no-strict should have no influence
     result = parse_single_name_into_parts(name, strict=strict)
-    expected = _dict_to_nameparts(expected_as_dict)
     assert result == expected
 
 
 @pytest.mark.parametrize(
-    "name, expected_as_dict", REGULAR_NAME_PARTS_PARSING_TEST_CASES
+    "name, expected", REGULAR_NAME_PARTS_PARSING_TEST_CASES_PRECOMPUTED
 )
 @pytest.mark.parametrize("strict", [True, False], ids=["strict", "non-strict"])
-def test_merge_last_name_first_inverse(name, expected_as_dict, strict):
+def test_merge_last_name_first_inverse(name, expected, strict):
     """Tests that merging name parts using the last-name-first method
     maintains the "semantics" of the name.
 
@@ -884,13 +995,81 @@ def test_merge_last_name_first_inverse(name, expected_as_dict, strict):
             i -= 1
         return count % 2 == 1
 
-    if any(ends_with_odd_slash(name) for name in expected_as_dict.values()):
+    if any(
+        ends_with_odd_slash(name)
+        for name in (expected.first, expected.von, expected.last, expected.jr)
+    ):
         pytest.skip("Inverse property does not hold for names ending with '\\'")
 
-    nameparts = _dict_to_nameparts(expected_as_dict)
-    merged = nameparts.merge_last_name_first
+    merged = expected.merge_last_name_first
     resplit = parse_single_name_into_parts(merged, strict=strict)
-    assert resplit == nameparts
+    assert resplit == expected
+
+
+# Name parts used in the middleware tests. Must not be modified by the tests.
+AMY = NameParts(first=["Amy"], last=["Author"], von=[], jr=[])
+BEN = NameParts(first=["Ben"], last=["Bystander"], von=[], jr=[])
+# Expected result of splitting the names of "Amy Author" and "Ben Bystander".
+_EXPECTED_SPLIT_AUTHORS = [AMY, BEN]
+
+# The name middlewares do not use the library containing the transformed block.
+_EMPTY_LIBRARY = Library()
+
+
+def _apply(middleware: BlockMiddleware, entry: Entry) -> Entry:
+    """Transform a single entry, like `middleware.transform` would for a library of it.
+
+    Asserts that the entry is transformed into exactly one entry."""
+    transformed = middleware.transform_block(entry, _EMPTY_LIBRARY)
+    assert isinstance(transformed, Entry)
+    return transformed
+
+
+def _clone_value(value):
+    """Copy of a field or metadata value, which may be a (list of) string or NameParts."""
+    if isinstance(value, list):
+        return [_clone_value(item) for item in value]
+    if isinstance(value, NameParts):
+        return NameParts(
+            first=list(value.first),
+            von=list(value.von),
+            last=list(value.last),
+            jr=list(value.jr),
+        )
+    return value
+
+
+def _fast_clone(entry: Entry) -> Entry:
+    """Equivalent of `deepcopy` for the entries used in this module."""
+    clone = Entry(
+        start_line=entry.start_line,
+        raw=entry.raw,
+        entry_type=entry.entry_type,
+        key=entry.key,
+        fields=[
+            Field(start_line=f.start_line, key=f.key, value=_clone_value(f.value))
+            for f in entry.fields
+        ],
+    )
+    for key, value in entry.parser_metadata.items():
+        clone.set_parser_metadata(key, _clone_value(value))
+    return clone
+
+
+def _snapshot_field(field: Field) -> Tuple:
+    """Record the state of a field, copying list values."""
+    value = list(field.value) if isinstance(field.value, list) else field.value
+    return field.key, field.start_line, value
+
+
+def _snapshot(entry: Entry) -> Tuple[Tuple, Dict[str, Tuple]]:
+    """Record the state of an entry before transforming it.
+
+    Returns the snapshot of the non-field attributes and
+    the snapshots of the fields, by field key."""
+    return snapshot_nonfield_entry_attributes(entry), {
+        field.key: _snapshot_field(field) for field in entry.fields
+    }
 
 
 @pytest.mark.parametrize("inplace", [True, False], ids=["inplace", "copy"])
@@ -902,63 +1081,167 @@ def test_separate_co_names_middleware(inplace):
     corresponding spliting function correctly."""
     input_entry = Entry(
         start_line=0,
-        raw="irrelevant-for-this-test",
+        raw=RAW_SENTINEL,
         entry_type="article",
         key="articleKey",
         fields=[
-            Field(start_line=0, key="title", value="A Test and Some More"),
+            Field(start_line=0, key="title", value=TITLE_VALUE),
             Field(start_line=1, key="author", value="A. Author and B. Author"),
             Field(start_line=2, key="editor", value="C. Editor and D. Editor"),
         ],
     )
-    original_copy = deepcopy(input_entry)
+    original_attributes, original_fields = _snapshot(input_entry)
 
     middleware = SeparateCoAuthors(allow_inplace_modification=inplace)
-    transformed_library = middleware.transform(Library([input_entry]))
-
-    assert len(transformed_library.entries) == 1
-    assert len(transformed_library.blocks) == 1
-
-    transformed_entry = transformed_library.entries[0]
-    assert transformed_entry.fields_dict["title"] == original_copy.fields_dict["title"]
+    transformed_entry = _apply(middleware, input_entry)
+    assert (
+        _snapshot_field(transformed_entry.fields_dict["title"])
+        == original_fields["title"]
+    )
     assert transformed_entry.fields_dict["author"].value == ["A. Author", "B. Author"]
     assert transformed_entry.fields_dict["editor"].value == ["C. Editor", "D. Editor"]
 
     # Make sure other attributes are not changed
-    assert_nonfield_entry_attributes_unchanged(original_copy, transformed_entry)
+    assert_nonfield_snapshot_unchanged(original_attributes, transformed_entry)
 
     # Assert `allow_inplace_modification` is respected
     assert_inplace_is_respected(inplace, input_entry, transformed_entry)
 
 
-@pytest.mark.parametrize("inplace", [True, False], ids=["inplace", "copy"])
-def test_merge_co_names_middleware(inplace: bool):
+def test_name_middleware_copy_leaves_input_unchanged():
+    """Test that without inplace modification, the input entry is not modified,
+    and does not share any mutable state with the transformed entry."""
+    input_entry = Entry(
+        start_line=0,
+        raw=RAW_SENTINEL,
+        entry_type="article",
+        key="articleKey",
+        fields=[
+            Field(start_line=0, key="keywords", value=["names", "parsing"]),
+            Field(start_line=1, key="author", value="A. Author and B. Author"),
+        ],
+    )
+    input_entry.set_parser_metadata("some_key", ["some", "value"])
+    original_copy = _fast_clone(input_entry)
+
+    middleware = SeparateCoAuthors(allow_inplace_modification=False)
+    transformed_entry = _apply(middleware, input_entry)
+    transformed_entry.fields_dict["keywords"].value.append("modified")
+    transformed_entry.get_parser_metadata("some_key").append("modified")
+
+    assert input_entry == original_copy
+    assert transformed_entry.fields_dict["author"].value == ["A. Author", "B. Author"]
+
+
+def test_name_middleware_copy_leaves_input_unchanged_on_error():
+    """Test that without inplace modification, the input entry is not modified
+    by changes to the failed block, even for fields not reached by the middleware."""
     input_entry = Entry(
         start_line=0,
-        raw="irrelevant-for-this-test",
+        raw=RAW_SENTINEL,
+        entry_type="article",
+        key="articleKey",
+        fields=[
+            Field(start_line=0, key="author", value=["Amy Author", "BB,"]),
+            Field(start_line=1, key="editor", value=["Ben Bystander"]),
+        ],
+    )
+    original_copy = _fast_clone(input_entry)
+
+    middleware = SplitNameParts(allow_inplace_modification=False)
+    failed_block = middleware.transform_block(input_entry, _EMPTY_LIBRARY)
+    assert isinstance(failed_block, MiddlewareErrorBlock)
+
+    failed_entry = failed_block.ignore_error_block
+    assert failed_entry is not input_entry
+    failed_entry.fields_dict["author"].value.append("modified")
+    failed_entry.fields_dict["editor"].value.append("modified")
+
+    assert input_entry == original_copy
+
+
+def test_name_middleware_copy_keeps_entry_type():
+    """Test that without inplace modification, subclasses of `Entry` are retained."""
+
+    class CustomEntry(Entry):
+        pass
+
+    input_entry = CustomEntry(
+        entry_type="article",
+        key="articleKey",
+        fields=[Field(start_line=0, key="author", value="A. Author and B. Author")],
+    )
+
+    middleware = SeparateCoAuthors(allow_inplace_modification=False)
+    transformed_entry = _apply(middleware, input_entry)
+
+    assert type(transformed_entry) is CustomEntry
+    assert transformed_entry.fields_dict["author"].value == ["A. Author", "B. Author"]
+
+
+def test_name_middleware_name_fields_property_override():
+    """Test that the name fields are taken from the (possibly overridden) property."""
+
+    class SeparateCoTranslators(SeparateCoAuthors):
+        @property
+        def name_fields(self):
+            return ("translator",)
+
+    input_entry = Entry(
         entry_type="article",
         key="articleKey",
         fields=[
-            Field(start_line=0, key="title", value="A Test and Some More"),
+            Field(start_line=0, key="author", value="A. Author and B. Author"),
+            Field(start_line=1, key="translator", value="C. Trans and D. Lator"),
+        ],
+    )
+
+    transformed_entry = _apply(SeparateCoTranslators(), input_entry)
+
+    assert transformed_entry.fields_dict["author"].value == "A. Author and B. Author"
+    assert transformed_entry.fields_dict["translator"].value == ["C. Trans", "D. Lator"]
+
+
+@pytest.fixture(scope="module")
+def merge_co_names_template() -> Entry:
+    """Entry with lists of co-authors and co-editors, for `test_merge_co_names_middleware`.
+
+    Must not be modified: use the `merge_co_names_entry` fixture to get a copy."""
+    return Entry(
+        start_line=0,
+        raw=RAW_SENTINEL,
+        entry_type="article",
+        key="articleKey",
+        fields=[
+            Field(start_line=0, key="title", value=TITLE_VALUE),
             Field(start_line=1, key="author", value=["A. Author", "B. Author"]),
             Field(start_line=2, key="editor", value=["C. Editor", "D. Editor"]),
         ],
     )
-    original_copy = deepcopy(input_entry)
 
-    middleware = MergeCoAuthors(allow_inplace_modification=inplace)
-    transformed_library = middleware.transform(Library([input_entry]))
 
-    assert len(transformed_library.entries) == 1
-    assert len(transformed_library.blocks) == 1
+@pytest.fixture
+def merge_co_names_entry(merge_co_names_template: Entry) -> Entry:
+    """A fresh copy of `merge_co_names_template`, which may be modified by the test."""
+    return _fast_clone(merge_co_names_template)
+
+
+@pytest.mark.parametrize("inplace", [True, False], ids=["inplace", "copy"])
+def test_merge_co_names_middleware(inplace: bool, merge_co_names_entry: Entry):
+    input_entry = merge_co_names_entry
+    original_attributes, original_fields = _snapshot(input_entry)
 
-    transformed_entry = transformed_library.entries[0]
-    assert transformed_entry.fields_dict["title"] == original_copy.fields_dict["title"]
+    middleware = MergeCoAuthors(allow_inplace_modification=inplace)
+    transformed_entry = _apply(middleware, input_entry)
+    assert (
+        _snapshot_field(transformed_entry.fields_dict["title"])
+        == original_fields["title"]
+    )
     assert transformed_entry.fields_dict["author"].value == "A. Author and B. Author"
     assert transformed_entry.fields_dict["editor"].value == "C. Editor and D. Editor"
 
     # Make sure other attributes are not changed
-    assert_nonfield_entry_attributes_unchanged(original_copy, transformed_entry)
+    assert_nonfield_snapshot_unchanged(original_attributes, transformed_entry)
 
     # Assert `allow_inplace_modification` is respected
     assert_inplace_is_respected(inplace, input_entry, transformed_entry)
@@ -968,31 +1251,26 @@ def test_merge_co_names_middleware(inplace: bool):
 def test_split_name_parts(inplace: bool):
     input_entry = Entry(
         start_line=0,
-        raw="irrelevant-for-this-test",
+        raw=RAW_SENTINEL,
         entry_type="article",
         key="articleKey",
         fields=[
-            Field(start_line=0, key="title", value="A Test and Some More"),
+            Field(start_line=0, key="title", value=TITLE_VALUE),
             Field(start_line=1, key="author", value=["Amy Author", "Ben Bystander"]),
         ],
     )
-    original_copy = deepcopy(input_entry)
+    original_attributes, original_fields = _snapshot(input_entry)
 
     middleware = SplitNameParts(allow_inplace_modification=inplace)
-    transformed_library = middleware.transform(Library([input_entry]))
-
-    assert len(transformed_library.entries) == 1
-    assert len(transformed_library.blocks) == 1
-
-    transformed_entry = transformed_library.entries[0]
-    assert transformed_entry.fields_dict["title"] == original_copy.fields_dict["title"]
-    assert transformed_entry.fields_dict["author"].value == [
-        NameParts(first=["Amy"], last=["Author"], von=[], jr=[]),
-        NameParts(first=["Ben"], last=["Bystander"], von=[], jr=[]),
-    ]
+    transformed_entry = _apply(middleware, input_entry)
+    assert (
+        _snapshot_field(transformed_entry.fields_dict["title"])
+        == original_fields["title"]
+    )
+    assert transformed_entry.fields_dict["author"].value == _EXPECTED_SPLIT_AUTHORS
 
     # Make sure other attributes are not changed
-    assert_nonfield_entry_attributes_unchanged(original_copy, transformed_entry)
+    assert_nonfield_snapshot_unchanged(original_attributes, transformed_entry)
 
     # Assert `allow_inplace_modification` is respected
     assert_inplace_is_respected(inplace, input_entry, transformed_entry)
@@ -1020,45 +1298,48 @@ def test_split_name_parts(inplace: bool):
 def test_merge_name_parts(inplace: bool, style: str, names: List[str]):
     input_entry = Entry(
         start_line=0,
-        raw="irrelevant-for-this-test",
+        raw=RAW_SENTINEL,
         entry_type="article",
         key="articleKey",
         fields=[
-            Field(start_line=0, key="title", value="A Test and Some More"),
+            Field(start_line=0, key="title", value=TITLE_VALUE),
             Field(
                 start_line=1,
                 key="author",
                 value=[
-                    NameParts(first=["Amy"], last=["Author"], von=[], jr=[]),
-                    NameParts(first=["Ben"], last=["Bystander"], von=[], jr=[]),
+                    AMY,
+                    BEN,
                     NameParts(first=["Carl"], last=["Carpooler\\"], von=[], jr=[]),
                     NameParts(first=["Donald"], last=["Doctor\\\\"], von=[], jr=[]),
                 ],
             ),
         ],
     )
-    original_copy = deepcopy(input_entry)
+    original_attributes, original_fields = _snapshot(input_entry)
 
     middleware = MergeNameParts(style=style, allow_inplace_modification=inplace)
-    transformed_library = middleware.transform(Library([input_entry]))
-
-    assert len(transformed_library.entries) == 1
-    assert len(transformed_library.blocks) == 1
-
-    transformed_entry = transformed_library.entries[0]
-    assert transformed_entry.fields_dict["title"] == original_copy.fields_dict["title"]
+    transformed_entry = _apply(middleware, input_entry)
+    assert (
+        _snapshot_field(transformed_entry.fields_dict["title"])
+        == original_fields["title"]
+    )
     assert transformed_entry.fields_dict["author"].value == names
 
     # Make sure other attributes are not changed
-    assert_nonfield_entry_attributes_unchanged(original_copy, transformed_entry)
+    assert_nonfield_snapshot_unchanged(original_attributes, transformed_entry)
 
     # Assert `allow_inplace_modification` is respected
     assert_inplace_is_respected(inplace, input_entry, transformed_entry)
 
 
-@pytest.mark.parametrize(
-    "name, reason",
-    [
+@pytest.fixture(scope="module")
+def split_name_parts_middleware() -> SplitNameParts:
+    """SplitNameParts middleware with default settings, which holds no per-input state."""
+    return SplitNameParts()
+
+
+def test_split_name_parts_exception(split_name_parts_middleware: SplitNameParts):
+    invalid_names = [
         ("BB,", "Trailing comma at end of name"),
         ("BB, ", "Trailing comma at end of name"),
         ("BB, ~\t", "Trailing comma at end of name"),
@@ -1070,32 +1351,40 @@ def test_merge_name_parts(inplace: bool, style: str, names: List[str]):
         ("AA BB CC}", "Unmatched closing brace"),
         ("AA BB CC}}}", "Unmatched closing brace"),
         ("{AA {BB CC}}}", "Unmatched closing brace"),
-    ],
-)
-def test_split_name_parts_exception(name: str, reason: str):
-    input_entry = Entry(
-        start_line=0,
-        raw="irrelevant-for-this-test",
-        entry_type="article",
-        key="articleKey",
-        fields=[
-            Field(start_line=0, key="title", value="A Test and Some More"),
-            Field(start_line=1, key="author", value=[name]),
-        ],
-    )
+    ]
+    input_entries = [
+        Entry(
+            start_line=i,
+            raw=RAW_SENTINEL,
+            entry_type="article",
+            key=f"articleKey{i}",
+            fields=[
+                Field(start_line=0, key="title", value=TITLE_VALUE),
+                Field(start_line=1, key="author", value=[name]),
+            ],
+        )
+        for i, (name, _) in enumerate(invalid_names)
+    ]
 
-    middleware = SplitNameParts()
+    middleware = split_name_parts_middleware
 
     # SplitNameParts always runs parse_single_name_into_parts(strict=True).
     # As such we should get the same errors as in test_name_splitting_strict_mode
     # but with the exceptions caught and wrapped in a MiddlewareErrorBlock.
-    transformed_library = middleware.transform(Library([input_entry]))
+    # All names are transformed at once, as a library with one entry per name.
+    transformed_library = middleware.transform(Library(input_entries))
 
-    # No valid entries now but 1 (failed) block
+    # No valid entries now but 1 (failed) block per name
     assert len(transformed_library.entries) == 0
-    assert len(transformed_library.blocks) == 1
-    assert len(transformed_library.failed_blocks) == 1
+    assert len(transformed_library.blocks) == len(invalid_names)
+    assert len(transformed_library.failed_blocks) == len(invalid_names)
 
-    # Using same test as in test_name_splitting_strict_mode
-    with pytest.raises(InvalidNameError, match=f".*{name}.*{reason}.*"):
-        raise transformed_library.failed_blocks[0].error
+    message_patterns = [
+        _error_message_pattern(name, reason) for name, reason in invalid_names
+    ]
+    for message_pattern, failed_block in zip(
+        message_patterns, transformed_library.failed_blocks
+    ):
+        # Using same test as in test_name_splitting_strict_mode
+        with pytest.raises(InvalidNameError, match=message_pattern):
+            raise failed_block.error
@@ -1,5 +1,10 @@
+import pickle
+import weakref
 from copy import copy, deepcopy
 from textwrap import dedent
+from typing import Callable, List
+
+import pytest
 
 from bibtexparser.model import (
     Entry,
@@ -10,236 +15,206 @@ from bibtexparser.model import (
     String,
 )
 
+# Content and raw representation of the comments in the tests.
+COMMENT = "This is my comment"
+COMMENT_RAW = "#  This is my comment"
+
+# Factories creating a model instance, each with an id and with
+# factories of instances differing from it.
+MODEL_CASES = [
+    (
+        "entry",
+        lambda: Entry("article", "key", [Field("field", "value", 1)], 1, "raw"),
+        [
+            # Different entry-type
+            lambda: Entry("book", "key", [Field("field", "value", 1)], 1, "raw"),
+            # Different fields
+            lambda: Entry(
+                "article",
+                "key",
+                [Field("field", "value", 1), Field("field2", "value", 2)],
+                1,
+                "raw",
+            ),
+        ],
+    ),
+    (
+        "string",
+        lambda: String("key", "value", 1, "raw"),
+        [
+            # Different key
+            lambda: String("key2", "value", 1, "raw"),
+            # Different value
+            lambda: String("key", "value2", 1, "raw"),
+        ],
+    ),
+    (
+        "preamble",
+        lambda: Preamble("value", 1, "raw"),
+        [
+            # Different value
+            lambda: Preamble("value2", 1, "raw"),
+        ],
+    ),
+    (
+        "implicit_comment",
+        lambda: ImplicitComment(start_line=1, comment=COMMENT, raw=COMMENT_RAW),
+        [
+            # Different comment
+            lambda: ImplicitComment(
+                start_line=1, comment="This is my comment2", raw=COMMENT_RAW
+            ),
+        ],
+    ),
+    (
+        "explicit_comment",
+        lambda: ExplicitComment(start_line=1, comment=COMMENT, raw=COMMENT_RAW),
+        [
+            # Different comment
+            lambda: ExplicitComment(
+                start_line=1, comment="This is my comment2", raw=COMMENT_RAW
+            ),
+        ],
+    ),
+]
 
-def test_entry_equality():
+MODEL_EQUALITY_CASES = [
+    pytest.param(factory, different_factories, id=case_id)
+    for case_id, factory, different_factories in MODEL_CASES
+]
+MODEL_FACTORIES = [
+    pytest.param(factory, id=case_id) for case_id, factory, _ in MODEL_CASES
+]
+
+
+@pytest.mark.parametrize("factory, different_factories", MODEL_EQUALITY_CASES)
+def test_equality(factory: Callable, different_factories: List[Callable]):
+    instance_1 = factory()
     # Equal to itself
-    entry_1 = Entry(
-        "article",
-        "key",
-        [Field("field", "value", 1)],
-        1,
-        "raw",
-    )
-    assert entry_1 == entry_1
-    # Equal to identical entry
-    entry_2 = Entry(
-        "article",
-        "key",
-        [Field("field", "value", 1)],
-        1,
-        "raw",
-    )
-    assert entry_1 == entry_2
-    # Not equal to entry with different entry-type
-    entry_3 = Entry(
-        "book",
-        "key",
-        [Field("field", "value", 1)],
-        1,
-        "raw",
-    )
-    assert entry_1 != entry_3
-    # Not equal to entry with different fields
-    entry_4 = Entry(
-        "article",
-        "key",
-        [Field("field", "value", 1), Field("field2", "value", 2)],
-        1,
-        "raw",
-    )
-    assert entry_1 != entry_4
+    assert instance_1 == instance_1
+    # Equal to identical instance
+    assert instance_1 == factory()
+    # Not equal to instances with different content
+    for different_factory in different_factories:
+        assert instance_1 != different_factory()
 
 
-def test_entry_copy():
-    entry_1 = Entry(
-        "article",
-        "key",
-        [Field("field", "value", 1)],
-        1,
-        "raw",
-    )
-    entry_2 = copy(entry_1)
-    assert entry_1 == entry_2
-    assert entry_1 is not entry_2
-    assert entry_1.fields == entry_2.fields
+@pytest.mark.parametrize("factory", MODEL_FACTORIES)
+def test_copy(factory: Callable):
+    instance_1 = factory()
+    instance_2 = copy(instance_1)
+    assert instance_1 == instance_2
+    assert instance_1 is not instance_2
 
 
-def test_entry_deepcopy():
+@pytest.mark.parametrize("factory", MODEL_FACTORIES)
+def test_deepcopy(factory: Callable):
+    instance_1 = factory()
+    instance_2 = deepcopy(instance_1)
+    assert instance_1 == instance_2
+    assert instance_1 is not instance_2
+
+
+def test_entry_deepcopy_copies_fields():
     entry_1 = Entry("article", "key", [Field("field", "value", 1)], 1, "raw")
     entry_2 = deepcopy(entry_1)
-    assert entry_1 == entry_2
-    assert entry_1 is not entry_2
     assert entry_1.fields is not entry_2.fields
     assert entry_1.fields == entry_2.fields
     assert entry_1.fields_dict["field"] is not entry_2.fields_dict["field"]
     assert entry_1.fields_dict["field"] == entry_2.fields_dict["field"]
 
 
-def test_string_equality():
-    # Equal to itself
-    string_1 = String(
-        "key",
-        "value",
-        1,
-        "raw",
-    )
-    assert string_1 == string_1
-    # Equal to identical string
-    string_2 = String(
-        "key",
-        "value",
-        1,
-        "raw",
-    )
-    assert string_1 == string_2
-    # Not equal to string with different key
-    string_3 = String(
-        "key2",
-        "value",
-        1,
-        "raw",
-    )
-    assert string_1 != string_3
-    # Not equal to string with different value
-    string_4 = String(
-        "key",
-        "value2",
-        1,
-        "raw",
-    )
-    assert string_1 != string_4
-
-
-def test_string_copy():
-    string_1 = String(
-        "key",
-        "value",
-        1,
-        "raw",
+def test_entry_copies_share_or_copy_parser_metadata():
+    entry_1 = Entry("article", "key", [Field("field", "value", 1)], 1, "raw")
+    entry_1.set_parser_metadata("metadata", ["value"])
+    assert copy(entry_1).parser_metadata is entry_1.parser_metadata
+    entry_2 = deepcopy(entry_1)
+    assert entry_2.parser_metadata is not entry_1.parser_metadata
+    assert entry_2.get_parser_metadata("metadata") == ["value"]
+    assert entry_2.get_parser_metadata("metadata") is not entry_1.get_parser_metadata(
+        "metadata"
     )
-    string_2 = copy(string_1)
-    assert string_1 == string_2
-    assert string_1 is not string_2
 
 
-def test_string_deepcopy():
-    string_1 = String(
-        "key",
-        "value",
-        1,
-        "raw",
-    )
-    string_2 = deepcopy(string_1)
-    assert string_1 == string_2
-    assert string_1 is not string_2
-
+def test_weak_references():
+    entry = Entry("article", "key", [Field("field", "value", 1)], 1, "raw")
+    assert weakref.ref(entry)() is entry
+    assert weakref.ref(entry.fields[0])() is entry.fields[0]
 
-def test_preamble_equality():
-    # Equal to itself
-    preamble_1 = Preamble("value", 1, "raw")
-    assert preamble_1 == preamble_1
-    # Equal to identical preamble
-    preamble_2 = Preamble("value", 1, "raw")
-    assert preamble_1 == preamble_2
-    # Not equal to preamble with different value
-    preamble_3 = Preamble("value2", 1, "raw")
-    assert preamble_1 != preamble_3
 
+@pytest.mark.parametrize("factory", MODEL_FACTORIES)
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(factory: Callable, protocol: int):
+    instance = factory()
+    assert pickle.loads(pickle.dumps(instance, protocol=protocol)) == instance
 
-def test_preamble_copy():
-    preamble_1 = Preamble("value", 1, "raw")
-    preamble_2 = copy(preamble_1)
-    assert preamble_1 == preamble_2
-    assert preamble_1 is not preamble_2
 
-
-def test_preable_deepcopy():
-    preamble_1 = Preamble("value", 1, "raw")
-    preamble_2 = deepcopy(preamble_1)
-    assert preamble_1 == preamble_2
-    assert preamble_1 is not preamble_2
+def test_unpickle_without_slots():
+    # Pickled by a version whose model classes had no `__slots__`, i.e.,
+    # `pickle.dumps(Entry("article", "key", [Field("field", "value", 1)], 1, "raw"))`.
+    pickled = (
+        b"\x80\x02cbibtexparser.model\nEntry\nq\x00)\x81q\x01}q\x02(X\x13\x00\x00\x00"
+        b"_start_line_in_fileq\x03K\x01X\x04\x00\x00\x00_rawq\x04X\x03\x00\x00\x00rawq"
+        b"\x05X\x10\x00\x00\x00_parser_metadataq\x06}q\x07X\x0b\x00\x00\x00_entry_typeq"
+        b"\x08X\x07\x00\x00\x00articleq\tX\x04\x00\x00\x00_keyq\nX\x03\x00\x00\x00keyq"
+        b"\x0bX\x07\x00\x00\x00_fieldsq\x0c]q\rcbibtexparser.model\nField\nq\x0e)\x81q"
+        b"\x0f}q\x10(X\x0b\x00\x00\x00_start_lineq\x11K\x01h\nX\x05\x00\x00\x00fieldq"
+        b"\x12X\x06\x00\x00\x00_valueq\x13X\x05\x00\x00\x00valueq\x14ubaub."
+    )
+    expected = Entry("article", "key", [Field("field", "value", 1)], 1, "raw")
+    assert pickle.loads(pickled) == expected
 
 
-def test_implicit_comment_equality():
-    # Equal to itself
-    comment_1 = ImplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    assert comment_1 == comment_1
-    # Equal to identical comment
-    comment_2 = ImplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    assert comment_1 == comment_2
-    # Not equal to comment with different comment
-    comment_3 = ImplicitComment(
-        start_line=1, comment="This is my comment2", raw="#  This is my comment"
-    )
-    assert comment_1 != comment_3
+class SlottedEntry(Entry):
+    """Entry subclass declaring a slot of its own, as a single string."""
 
+    __slots__ = "extra"
 
-def test_implicit_comment_copy():
-    comment_1 = ImplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    comment_2 = copy(comment_1)
-    assert comment_1 == comment_2
-    assert comment_1 is not comment_2
 
+class PrivateSlottedEntry(SlottedEntry):
+    """Entry subclass with a private slot, whose name is mangled."""
 
-def test_implicit_comment_deepcopy():
-    comment_1 = ImplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    comment_2 = deepcopy(comment_1)
-    assert comment_1 == comment_2
-    assert comment_1 is not comment_2
+    __slots__ = ("__private",)
 
+    def set_private(self, value):
+        self.__private = value
 
-def test_explicit_comment_equality():
-    # Equal to itself
-    comment_1 = ExplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    assert comment_1 == comment_1
-    # Equal to identical comment
-    comment_2 = ExplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    assert comment_1 == comment_2
-    # Not equal to comment with different comment
-    comment_3 = ExplicitComment(
-        start_line=1, comment="This is my comment2", raw="#  This is my comment"
-    )
-    assert comment_1 != comment_3
+    def get_private(self):
+        return self.__private
 
 
-def test_explicit_comment_copy():
-    comment_1 = ExplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    comment_2 = copy(comment_1)
-    assert comment_1 == comment_2
-    assert comment_1 is not comment_2
+@pytest.mark.parametrize("set_slots", [False, True], ids=["unset", "set"])
+def test_slotted_subclass(set_slots: bool):
+    entry = PrivateSlottedEntry("article", "key", [Field("field", "value", 1)], 1)
+    if set_slots:
+        entry.extra = ["extra"]
+        entry.set_private("private")
 
+    copies = [
+        copy(entry),
+        deepcopy(entry),
+        *(pickle.loads(pickle.dumps(entry, protocol=p)) for p in range(2)),
+        pickle.loads(pickle.dumps(entry)),
+    ]
+    assert entry == entry
+    for entry_copy in copies:
+        assert type(entry_copy) is PrivateSlottedEntry
+        assert entry_copy == entry
+        if set_slots:
+            assert entry_copy.extra == ["extra"]
+            assert entry_copy.get_private() == "private"
+        else:
+            assert not hasattr(entry_copy, "extra")
 
-def test_explicit_comment_deepcopy():
-    comment_1 = ExplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    comment_2 = deepcopy(comment_1)
-    assert comment_1 == comment_2
-    assert comment_1 is not comment_2
+    other = PrivateSlottedEntry("article", "key", [Field("field", "value", 1)], 1)
+    other.extra = ["other"]
+    assert entry != other
 
 
 def test_implicit_and_explicit_comment_equality():
     # Equal to itself
-    comment_1 = ImplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
-    comment_2 = ExplicitComment(
-        start_line=1, comment="This is my comment", raw="#  This is my comment"
-    )
+    comment_1 = ImplicitComment(start_line=1, comment=COMMENT, raw=COMMENT_RAW)
+    comment_2 = ExplicitComment(start_line=1, comment=COMMENT, raw=COMMENT_RAW)
     assert comment_1 != comment_2
     assert comment_2 != comment_1
 